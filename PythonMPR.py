@@ -1,30 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, StringVar, Entry, Label, Button, Text, messagebox
-import networkx as nx
-import matplotlib.pyplot as plt
 import math
 
-
-class Activity:
-    def __init__(self, name, duration):
-        self.name = name
-        self.duration = duration
-        self.dependencies = []
-        self.earliest_start = 0
-        self.earliest_finish = 0
-        self.latest_start = 0
-        self.latest_finish = 0
-        self.slack = 0
-        self.critical_path = False
-
-    def add_dependency(self, activity):
-        self.dependencies.append(activity)
-
-    def is_critical_path(self):
-        return self.critical_path
-
-    def set_critical_path(self, is_critical):
-        self.critical_path = is_critical
+from mprcore import (Activity, PERTTask, check_activity_name, completion_probability, deadline_for_confidence,
+                     parse_dependency, schedule_network)
 
 
 class CPMCalculatorGUI:
@@ -35,7 +14,6 @@ class CPMCalculatorGUI:
         self.activities = []
         self.critical_path = []
         self.cpm_time = 0
-        self.graph = nx.DiGraph()
 
         self.create_input_panel()
         self.create_output_panel()
@@ -46,7 +24,7 @@ class CPMCalculatorGUI:
 
         ttk.Label(input_panel, text="Activity Name:").grid(row=0, column=0, sticky="e")
         ttk.Label(input_panel, text="Duration:").grid(row=1, column=0, sticky="e")
-        ttk.Label(input_panel, text="Dependencies (comma-separated):").grid(row=2, column=0, sticky="e")
+        ttk.Label(input_panel, text="Dependencies (e.g. A, B:SS+2):").grid(row=2, column=0, sticky="e")
 
         self.activity_name_var = StringVar()
         self.duration_var = StringVar()
@@ -80,6 +58,12 @@ class CPMCalculatorGUI:
             messagebox.showerror("Error", "Please fill in both activity name and duration.")
             return
 
+        try:
+            check_activity_name(name)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
         try:
             duration = int(duration_text)
             if duration <= 0:
@@ -88,15 +72,18 @@ class CPMCalculatorGUI:
             messagebox.showerror("Error", f"Invalid input for duration: {str(e)}")
             return
 
-        dependencies = [dep.strip() for dep in dependencies_text.split(',')]
+        try:
+            dependencies = [parse_dependency(dep) for dep in dependencies_text.split(',') if dep.strip()]
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
 
         activity = Activity(name, duration)
 
-        for dependency in dependencies:
+        for dependency, relation, lag in dependencies:
             dependency_activity = next((a for a in self.activities if a.name == dependency), None)
             if dependency_activity:
-                activity.add_dependency(dependency_activity)
-                self.graph.add_edge(dependency_activity.name, name)
+                activity.add_dependency(dependency_activity, relation, lag)
 
         self.activities.append(activity)
 
@@ -131,73 +118,27 @@ class CPMCalculatorGUI:
             messagebox.showwarning("Warning", "Please add activities before calculating CPM.")
             return
 
-        start_activity = self.activities[0]
-        start_activity.earliest_start = 0
-        start_activity.earliest_finish = start_activity.duration
-
-        # Perform forward pass
-        for current_activity in self.activities[1:]:
-            max_earliest_finish = 0
-            for dependency in current_activity.dependencies:
-                if dependency.earliest_finish > max_earliest_finish:
-                    max_earliest_finish = dependency.earliest_finish
-            current_activity.earliest_start = max_earliest_finish
-            current_activity.earliest_finish = current_activity.earliest_start + current_activity.duration
-
-        # Calculate latest start and finish times for the last activity
-        end_activity = self.activities[-1]
-        end_activity.latest_finish = end_activity.earliest_finish
-        end_activity.latest_start = end_activity.latest_finish - end_activity.duration
+        _, self.cpm_time, self.critical_path = schedule_network(self.activities)
 
-        self.critical_path.append(end_activity)
-
-        # Perform backward pass
-        for current_activity in reversed(self.activities[:-1]):
-            min_latest_start = float('inf')
-            for dependent_activity in self.activities:
-                if current_activity in dependent_activity.dependencies:
-                    latest_start = dependent_activity.latest_start - current_activity.duration
-                    min_latest_start = min(min_latest_start, latest_start)
-
-            current_activity.latest_start = min_latest_start
-            current_activity.latest_finish = current_activity.latest_start + current_activity.duration
-
-            # Calculate slack for current_activity
-            current_activity.slack = current_activity.latest_start - current_activity.earliest_start
-
-            # Check if current_activity is on the critical path
-            if current_activity.slack == 0 or current_activity == end_activity:
-                current_activity.set_critical_path(True)
-                self.critical_path.append(current_activity)
+    def display_graph(self):
+        # networkx and matplotlib are only loaded once a graph is actually shown
+        import networkx as nx
+        import matplotlib.pyplot as plt
 
-        # Calculate the CPM time
-        self.cpm_time = end_activity.earliest_finish
+        graph = nx.DiGraph()
+        graph.add_nodes_from(activity.name for activity in self.activities)
+        for activity in self.activities:
+            for link in activity.dependencies:
+                graph.add_edge(link.activity.name, activity.name, relation=link.relation, lag=link.lag)
 
-    def display_graph(self):
         # Visualize the graph
-        pos = nx.spring_layout(self.graph)
-        nx.draw(self.graph, pos, with_labels=True, font_weight='bold', node_color='blue', font_color='white')
-        nx.draw_networkx_nodes(self.graph, pos, nodelist=[activity.name for activity in self.critical_path], node_color='red')
+        pos = nx.spring_layout(graph)
+        nx.draw(graph, pos, with_labels=True, font_weight='bold', node_color='blue', font_color='white')
+        nx.draw_networkx_nodes(graph, pos, nodelist=[activity.name for activity in self.critical_path], node_color='red')
         plt.title("Activity Graph")
         plt.show()
 
 
-class PERTTask:
-    def __init__(self, name, optimistic, most_likely, pessimistic):
-        self.name = name
-        self.optimistic = optimistic
-        self.most_likely = most_likely
-        self.pessimistic = pessimistic
-        self.expected = self.calculate_expected()
-        self.variance = self.calculate_variance()
-
-    def calculate_expected(self):
-        return (self.optimistic + 4 * self.most_likely + self.pessimistic) / 6
-
-    def calculate_variance(self):
-        return ((self.pessimistic - self.optimistic) / 6) ** 2
-
-
 class PERTCalculatorGUI:
     def __init__(self):
         self.tasks = []
@@ -300,20 +241,15 @@ class PERTCalculatorGUI:
             probability = self.calculate_probability(task.expected, task.variance)
             self.output_text.insert(tk.END, f"{task.name}: {probability:.2f}\n")
 
+        self.output_text.insert(tk.END, "Deadline for Confidence:\n")
+        for confidence in (0.5, 0.9, 0.95):
+            deadline = deadline_for_confidence(confidence, self.project_time, self.project_standard_deviation)
+            self.output_text.insert(tk.END, f"{confidence:.0%}: {deadline:.2f}\n")
+
         self.output_text.config(state="disabled")
 
     def calculate_probability(self, expected, variance):
-        z = (self.project_time - expected) / self.project_standard_deviation
-        return 1 - self.cumulative_distribution(z)
-
-    def cumulative_distribution(self, z):
-        t = 1 / (1 + 0.2316419 * abs(z))
-        y = (((((1.330274429 * t - 1.821255978) * t + 1.781477937) * t - 0.356563782) * t + 0.319381530) * t) / (2 * math.pi) + 0.5
-
-        if z > 0:
-            return 1 - y
-        else:
-            return y
+        return 1 - completion_probability(self.project_time, expected, self.project_standard_deviation)
 
     def clear_screen(self):
         self.tasks.clear()
@@ -0,0 +1,46 @@
+import re
+import subprocess
+import sys
+
+# Cumulative import time per module, measured in a fresh interpreter with -X importtime.
+# The scheduling core must stay under its budget; the front ends are reported for comparison.
+BUDGETS_MS = {"mprcore": 100.0}
+MODULES = ["mprcore", "PythonMPR", "combinedmpr"]
+HEAVY_MODULES = ("numpy", "networkx", "matplotlib")
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure_import(module, runs=5):
+    best = None
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+        imported = {}
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if match:
+                imported[match.group(4)] = int(match.group(2)) / 1000.0
+        if best is None or imported[module] < best[module]:
+            best = imported
+    return best
+
+
+def main():
+    failed = False
+    for module in MODULES:
+        imported = measure_import(module)
+        heavy = [name for name in HEAVY_MODULES if name in imported]
+        budget = BUDGETS_MS.get(module)
+        status = ""
+        if budget is not None:
+            status = "ok" if imported[module] <= budget else "OVER BUDGET"
+            failed = failed or imported[module] > budget
+        print(f"{module:<12} {imported[module]:8.1f} ms  budget: {budget or '-':>5}  heavy imports: {', '.join(heavy) or 'none'}  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,46 +1,440 @@
 import tkinter as tk
 from tkinter import ttk, StringVar, Text, messagebox
-import networkx as nx
-import matplotlib.pyplot as plt
 import sqlite3
 import math
+from collections import defaultdict
+
+from mprcore import (Activity, PERTTask, WorkPackage, check_activity_name, completion_probability,
+                     deadline_for_confidence, format_dependency, parse_dependency)
+
+
+class NetworkViewer:
+    # Activity network drawn straight onto a canvas. A uniform grid over world coordinates finds
+    # the nodes and edges inside the viewport, so only those become canvas items.
+    CELL_SIZE = 200
+    COLUMN_WIDTH = 40
+    ROW_HEIGHT = 30
+    NODE_RADIUS = 8
+    MAX_ITEMS = 4000
+    MIN_BIN_PIXELS = 4
+
+    def __init__(self, parent, width=600, height=450):
+        self.canvas = tk.Canvas(parent, width=width, height=height, background="white")
+        self.scale = 1.0
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.positions = {}
+        self.edges = []
+        self.node_grid = defaultdict(list)
+        self.edge_grid = defaultdict(list)
+        self.long_edges = []
+        self.long_edge_segments = None
+        self.layout = None
+        self.density_bins = {}
+        self.bins = {}
+        self.critical_only = False
+        self.node_items = {}
+        self.edge_items = {}
+        self.bin_items = {}
+        self.redraw_job = None
+        self.drag_start = None
+
+        self.canvas.bind("<ButtonPress-1>", self.start_pan)
+        self.canvas.bind("<B1-Motion>", self.pan)
+        self.canvas.bind("<ButtonRelease-1>", lambda event: self.schedule_redraw())
+        self.canvas.bind("<Double-Button-1>", lambda event: self.fit())
+        self.canvas.bind("<MouseWheel>", lambda event: self.zoom(event, 1.2 if event.delta > 0 else 1 / 1.2))
+        self.canvas.bind("<Button-4>", lambda event: self.zoom(event, 1.2))
+        self.canvas.bind("<Button-5>", lambda event: self.zoom(event, 1 / 1.2))
+        self.canvas.bind("<Configure>", lambda event: self.schedule_redraw())
+
+    def show(self, activities):
+        # The layout only depends on the activities, their earliest starts and their links. When none
+        # of those changed, the items already on screen are recoloured instead of laid out again.
+        layout = [(activity, activity.earliest_start, len(activity.dependencies)) for activity in activities]
+        if layout == self.layout and self.critical_only:
+            # Only critical links were drawn, so a changed critical set changes which edges are on screen
+            self.redraw()
+        elif layout == self.layout:
+            self.update_critical()
+        else:
+            self.set_network(activities)
+        self.layout = layout
+
+    def set_network(self, activities):
+        # Layered layout in O(V): x follows the earliest start, y stacks activities sharing it
+        import numpy as np
+
+        self.positions = {}
+        lanes = defaultdict(int)
+        for activity in activities:
+            column = activity.earliest_start
+            self.positions[activity] = (column * self.COLUMN_WIDTH, lanes[column] * self.ROW_HEIGHT)
+            lanes[column] += 1
+
+        self.edges = [(link.activity, activity, link) for activity in activities for link in activity.dependencies
+                      if link.activity in self.positions]
+
+        self.node_grid = defaultdict(list)
+        for activity, (x, y) in self.positions.items():
+            self.node_grid[self.cell(x, y)].append(activity)
+
+        self.edge_grid = defaultdict(list)
+        self.long_edges = []
+        for edge in self.edges:
+            (x1, y1), (x2, y2) = self.positions[edge[0]], self.positions[edge[1]]
+            cx1, cy1 = self.cell(min(x1, x2), min(y1, y2))
+            cx2, cy2 = self.cell(max(x1, x2), max(y1, y2))
+            if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > 16:
+                self.long_edges.append(edge)
+                continue
+            for cx in range(cx1, cx2 + 1):
+                for cy in range(cy1, cy2 + 1):
+                    self.edge_grid[(cx, cy)].append(edge)
+        self.long_edge_segments = np.array([self.positions[edge[0]] + self.positions[edge[1]] for edge in self.long_edges]).reshape(-1, 4)
+        self.density_bins = {}
+
+        self.fit()
+
+    def cell(self, x, y):
+        return int(x // self.CELL_SIZE), int(y // self.CELL_SIZE)
+
+    def to_screen(self, x, y):
+        return x * self.scale + self.offset_x, y * self.scale + self.offset_y
+
+    def viewport(self):
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        return (-self.offset_x / self.scale, -self.offset_y / self.scale,
+                (width - self.offset_x) / self.scale, (height - self.offset_y) / self.scale)
+
+    def fit(self):
+        if not self.positions:
+            self.canvas.delete("all")
+            return
+        xs = [x for x, y in self.positions.values()]
+        ys = [y for x, y in self.positions.values()]
+        width, height = max(self.canvas.winfo_width(), 1), max(self.canvas.winfo_height(), 1)
+        span_x, span_y = max(xs) - min(xs) + 2 * self.COLUMN_WIDTH, max(ys) - min(ys) + 2 * self.ROW_HEIGHT
+        self.scale = min(width / span_x, height / span_y)
+        self.offset_x = (self.COLUMN_WIDTH - min(xs)) * self.scale
+        self.offset_y = (self.ROW_HEIGHT - min(ys)) * self.scale
+        self.redraw()
+
+    def start_pan(self, event):
+        self.drag_start = (event.x, event.y)
+
+    def pan(self, event):
+        # Existing items are only shifted; newly exposed regions are filled in once the drag settles
+        dx, dy = event.x - self.drag_start[0], event.y - self.drag_start[1]
+        self.drag_start = (event.x, event.y)
+        self.offset_x += dx
+        self.offset_y += dy
+        self.canvas.move("all", dx, dy)
+
+    def zoom(self, event, factor):
+        self.offset_x = event.x - (event.x - self.offset_x) * factor
+        self.offset_y = event.y - (event.y - self.offset_y) * factor
+        self.scale *= factor
+        self.canvas.scale("all", event.x, event.y, factor, factor)
+        self.schedule_redraw()
+
+    def schedule_redraw(self):
+        if self.redraw_job is not None:
+            self.canvas.after_cancel(self.redraw_job)
+        self.redraw_job = self.canvas.after(40, self.redraw)
+
+    def visible_cells(self, grid, factor=1):
+        # Keys of grid inside the viewport; with a factor, keys are bins of factor x factor cells
+        x1, y1, x2, y2 = self.viewport()
+        (cx1, cy1), (cx2, cy2) = self.cell(x1, y1), self.cell(x2, y2)
+        cx1, cy1, cx2, cy2 = cx1 // factor, cy1 // factor, cx2 // factor, cy2 // factor
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(grid):
+            return [cell for cell in grid if cx1 <= cell[0] <= cx2 and cy1 <= cell[1] <= cy2]
+        return [(cx, cy) for cx in range(cx1, cx2 + 1) for cy in range(cy1, cy2 + 1) if (cx, cy) in grid]
+
+    def redraw(self):
+        self.redraw_job = None
+        self.canvas.delete("all")
+        self.node_items = {}
+        self.edge_items = {}
+        self.bin_items = {}
+        self.critical_only = False
+
+        x1, y1, x2, y2 = self.viewport()
+        if self.scale * self.NODE_RADIUS < 1.5:
+            self.draw_density()
+            return
+        cells = self.visible_cells(self.node_grid)
+        if sum(len(self.node_grid[cell]) for cell in cells) > 4 * self.MAX_ITEMS:
+            self.draw_density()
+            return
 
+        nodes = [activity for cell in cells for activity in self.node_grid[cell]
+                 if x1 <= self.positions[activity][0] <= x2 and y1 <= self.positions[activity][1] <= y2]
+        if len(nodes) > self.MAX_ITEMS:
+            self.draw_density()
+            return
 
-class Task:
-    def __init__(self, name, duration):
-        self.name = name
-        self.duration = duration
-
-class Activity(Task):
-    def __init__(self, name, duration):
-        super().__init__(name, duration)
-        self.dependencies = []
-        self.earliest_start = 0
-        self.earliest_finish = 0
-        self.latest_start = 0
-        self.latest_finish = 0
-        self.slack = 0
-        self.critical_path = False
-
-    def add_dependency(self, activity):
-        self.dependencies.append(activity)
-
-    def is_critical_path(self):
-        return self.critical_path
+        edges = {id(edge): edge for cell in self.visible_cells(self.edge_grid) for edge in self.edge_grid[cell]}
+        for index in self.crossing_long_edges(x1, y1, x2, y2):
+            edges[id(self.long_edges[index])] = self.long_edges[index]
+
+        if len(nodes) + len(edges) > self.MAX_ITEMS:
+            self.critical_only = True
+            edges = {key: edge for key, edge in edges.items() if edge[2].critical_path}
+        for predecessor, successor, link in edges.values():
+            start, end = self.to_screen(*self.positions[predecessor]), self.to_screen(*self.positions[successor])
+            self.edge_items[link] = self.canvas.create_line(*start, *end, arrow=tk.LAST if self.scale >= 0.5 else None,
+                                                            tags=("link", link.relation))
+            # Plain finish-to-start links stay unlabelled to keep dense views readable
+            if self.scale >= 0.75 and (link.relation != "FS" or link.lag):
+                label = link.relation + (f"{link.lag:+d}" if link.lag else "")
+                self.canvas.create_text((start[0] + end[0]) / 2, (start[1] + end[1]) / 2 - 6, text=label,
+                                        fill="gray30", tags=("link", link.relation))
+
+        radius = max(self.NODE_RADIUS * self.scale, 1.5)
+        for activity in nodes:
+            x, y = self.to_screen(*self.positions[activity])
+            self.node_items[activity] = self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius, outline="")
+            if self.scale >= 0.75:
+                self.canvas.create_text(x, y - radius - 6, text=activity.name)
+
+        self.update_critical()
+
+    def crossing_long_edges(self, x1, y1, x2, y2):
+        # Liang-Barsky clipping of every long edge against the viewport at once
+        import numpy as np
+
+        if not self.long_edges:
+            return []
+        start, delta = self.long_edge_segments[:, :2], self.long_edge_segments[:, 2:] - self.long_edge_segments[:, :2]
+        low, high = np.zeros(len(start)), np.ones(len(start))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for axis, (lower, upper) in enumerate(((x1, x2), (y1, y2))):
+                t1 = (lower - start[:, axis]) / delta[:, axis]
+                t2 = (upper - start[:, axis]) / delta[:, axis]
+                flat = delta[:, axis] == 0
+                inside = (start[:, axis] >= lower) & (start[:, axis] <= upper)
+                low = np.where(flat, np.where(inside, low, 1.0), np.maximum(low, np.minimum(t1, t2)))
+                high = np.where(flat, np.where(inside, high, 0.0), np.minimum(high, np.maximum(t1, t2)))
+        return np.flatnonzero(low <= high)
+
+    def draw_density(self):
+        # Level of detail for zoomed-out views. Grid cells are merged in powers of two until a bin is a
+        # few pixels wide and the bins across the viewport fit the item budget; each bin is shaded by
+        # how many activities it holds and outlined red when it holds critical work.
+        x1, y1, x2, y2 = self.viewport()
+        (cx1, cy1), (cx2, cy2) = self.cell(x1, y1), self.cell(x2, y2)
+        factor = 1
+        while (self.CELL_SIZE * factor * self.scale < self.MIN_BIN_PIXELS or
+               (cx2 // factor - cx1 // factor + 1) * (cy2 // factor - cy1 // factor + 1) > self.MAX_ITEMS):
+            factor *= 2
+
+        if factor not in self.density_bins:
+            bins = defaultdict(list)
+            for (cx, cy), activities in self.node_grid.items():
+                bins[(cx // factor, cy // factor)].extend(activities)
+            self.density_bins[factor] = bins
+        self.bins = self.density_bins[factor]
+
+        visible = self.visible_cells(self.bins, factor)
+        counts = [len(self.bins[key]) for key in visible]
+        busiest = max(counts, default=1)
+        size = self.CELL_SIZE * factor * self.scale
+        for key, count in zip(visible, counts):
+            x, y = self.to_screen(key[0] * self.CELL_SIZE * factor, key[1] * self.CELL_SIZE * factor)
+            shade = 230 - int(180 * count / busiest)
+            self.bin_items[key] = self.canvas.create_rectangle(x, y, x + size, y + size, fill=f"#{shade:02x}{shade:02x}ff")
+        self.update_critical()
+
+    def update_critical(self):
+        # Recolours the items already on screen; nothing is created or deleted
+        for activity, item in self.node_items.items():
+            self.canvas.itemconfigure(item, fill="red" if activity.is_critical_path() else "blue")
+        for link, item in self.edge_items.items():
+            self.canvas.itemconfigure(item, fill="red" if link.critical_path else "gray", width=2 if link.critical_path else 1)
+        for key, item in self.bin_items.items():
+            critical = any(activity.is_critical_path() for activity in self.bins[key])
+            self.canvas.itemconfigure(item, outline="red" if critical else "")
+
+
+class GanttChart:
+    # Gantt chart that only keeps items for the rows and time window on screen. Scrolling shifts the
+    # existing bars and creates or deletes the rows at the edges; a schedule change re-coordinates
+    # just the bars whose times moved.
+    ROW_HEIGHT = 22
+    BAR_HEIGHT = 14
+    HEADER_HEIGHT = 24
+
+    def __init__(self, parent, width=760, height=500):
+        self.canvas = tk.Canvas(parent, width=width, height=height, background="white")
+        self.scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self.yview)
+        self.xscrollbar = ttk.Scrollbar(parent, orient=tk.HORIZONTAL, command=self.xview)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.xscrollbar.grid(row=1, column=0, sticky="ew")
+        parent.columnconfigure(0, weight=1)
+        parent.rowconfigure(0, weight=1)
 
-    def set_critical_path(self, is_critical):
-        self.critical_path = is_critical
+        self.activities = []
+        self.finish = 0
+        self.pixels_per_unit = 20.0
+        self.scroll_x = 0.0
+        self.scroll_y = 0.0
+        self.drawn = {}
+        self.drag_start = None
+
+        self.canvas.bind("<ButtonPress-1>", self.start_drag)
+        self.canvas.bind("<B1-Motion>", self.drag)
+        self.canvas.bind("<MouseWheel>", lambda event: self.scroll_rows(-1 if event.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda event: self.scroll_rows(-1))
+        self.canvas.bind("<Button-5>", lambda event: self.scroll_rows(1))
+        self.canvas.bind("<Control-MouseWheel>", lambda event: self.zoom(event, 1.25 if event.delta > 0 else 0.8))
+        self.canvas.bind("<Control-Button-4>", lambda event: self.zoom(event, 1.25))
+        self.canvas.bind("<Control-Button-5>", lambda event: self.zoom(event, 0.8))
+        self.canvas.bind("<Configure>", lambda event: self.sync())
+
+    def set_schedule(self, activities):
+        # The same rows only need their changed bars updated; a different row set starts over
+        if len(activities) != len(self.activities) or any(a is not b for a, b in zip(activities, self.activities)):
+            self.activities = list(activities)
+            self.clear()
+        self.finish = max((max(activity.earliest_finish, activity.latest_finish) for activity in self.activities), default=0)
+        self.sync()
+
+    def clear(self):
+        self.canvas.delete("bar")
+        self.drawn = {}
+
+    def total_height(self):
+        return len(self.activities) * self.ROW_HEIGHT
+
+    def total_width(self):
+        return self.finish * self.pixels_per_unit
+
+    def visible_rows(self):
+        height = self.canvas.winfo_height() - self.HEADER_HEIGHT
+        first_row = int(self.scroll_y // self.ROW_HEIGHT)
+        return first_row, min(int((self.scroll_y + height) // self.ROW_HEIGHT) + 1, len(self.activities))
+
+    def scroll_to(self, scroll_x, scroll_y):
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height() - self.HEADER_HEIGHT
+        scroll_x = min(max(scroll_x, 0.0), max(self.total_width() - width, 0.0))
+        scroll_y = min(max(scroll_y, 0.0), max(self.total_height() - height, 0.0))
+        self.canvas.move("bar", self.scroll_x - scroll_x, self.scroll_y - scroll_y)
+        self.scroll_x, self.scroll_y = scroll_x, scroll_y
+        self.sync()
+
+    def scroll_rows(self, rows):
+        self.scroll_to(self.scroll_x, self.scroll_y + rows * 3 * self.ROW_HEIGHT)
+
+    def yview(self, command, *args):
+        height = self.canvas.winfo_height() - self.HEADER_HEIGHT
+        if command == "moveto":
+            self.scroll_to(self.scroll_x, float(args[0]) * self.total_height())
+            # A jump far down a long schedule usually lands on rows that start later than the time
+            # window on screen, so the window follows the earliest start of those rows
+            first_row, last_row = self.visible_rows()
+            if not self.drawn and first_row < last_row:
+                earliest = min(activity.earliest_start for activity in self.activities[first_row:last_row])
+                self.scroll_to(earliest * self.pixels_per_unit, self.scroll_y)
+        elif args[1] == "pages":
+            self.scroll_to(self.scroll_x, self.scroll_y + int(args[0]) * height)
+        else:
+            self.scroll_to(self.scroll_x, self.scroll_y + int(args[0]) * self.ROW_HEIGHT)
+
+    def xview(self, command, *args):
+        width = self.canvas.winfo_width()
+        if command == "moveto":
+            self.scroll_to(float(args[0]) * self.total_width(), self.scroll_y)
+        elif args[1] == "pages":
+            self.scroll_to(self.scroll_x + int(args[0]) * width, self.scroll_y)
+        else:
+            self.scroll_to(self.scroll_x + int(args[0]) * width / 10, self.scroll_y)
+
+    def start_drag(self, event):
+        self.drag_start = (event.x, event.y)
+
+    def drag(self, event):
+        dx, dy = event.x - self.drag_start[0], event.y - self.drag_start[1]
+        self.drag_start = (event.x, event.y)
+        self.scroll_to(self.scroll_x - dx, self.scroll_y - dy)
+
+    def zoom(self, event, factor):
+        time_at_pointer = (self.scroll_x + event.x) / self.pixels_per_unit
+        self.pixels_per_unit *= factor
+        self.scroll_x = max(time_at_pointer * self.pixels_per_unit - event.x, 0.0)
+        self.clear()
+        self.sync()
+
+    def bar_coords(self, row, start, finish):
+        top = self.HEADER_HEIGHT + row * self.ROW_HEIGHT - self.scroll_y + (self.ROW_HEIGHT - self.BAR_HEIGHT) / 2
+        return (start * self.pixels_per_unit - self.scroll_x, top,
+                finish * self.pixels_per_unit - self.scroll_x, top + self.BAR_HEIGHT)
+
+    def sync(self):
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        first_row, last_row = self.visible_rows()
+        first_time, last_time = self.scroll_x / self.pixels_per_unit, (self.scroll_x + width) / self.pixels_per_unit
+
+        visible = {}
+        for row in range(first_row, last_row):
+            activity = self.activities[row]
+            if max(activity.earliest_finish, activity.latest_finish) >= first_time and activity.earliest_start <= last_time:
+                visible[activity] = row
+
+        for activity in [activity for activity in self.drawn if activity not in visible]:
+            self.canvas.delete(*self.drawn.pop(activity)[1])
+
+        for activity, row in visible.items():
+            geometry = (row, activity.earliest_start, activity.earliest_finish, activity.latest_finish, activity.is_critical_path())
+            if activity in self.drawn and self.drawn[activity][0] == geometry:
+                continue
+            bar_coords = self.bar_coords(row, activity.earliest_start, activity.earliest_finish)
+            slack_coords = self.bar_coords(row, activity.earliest_finish, max(activity.latest_finish, activity.earliest_finish))
+            colour = "red" if activity.is_critical_path() else "blue"
+            if activity in self.drawn:
+                bar, slack, label = self.drawn[activity][1]
+                self.canvas.coords(bar, *bar_coords)
+                self.canvas.coords(slack, *slack_coords)
+                self.canvas.coords(label, bar_coords[0] + 3, (bar_coords[1] + bar_coords[3]) / 2)
+                self.canvas.itemconfigure(bar, fill=colour)
+            else:
+                bar = self.canvas.create_rectangle(*bar_coords, fill=colour, outline="", tags="bar")
+                slack = self.canvas.create_rectangle(*slack_coords, fill="#d0d0d0", outline="", tags="bar")
+                label = self.canvas.create_text(bar_coords[0] + 3, (bar_coords[1] + bar_coords[3]) / 2, text=activity.name,
+                                                anchor="w", fill="white", tags="bar")
+            self.drawn[activity] = (geometry, (bar, slack, label))
+
+        self.draw_axis(width, first_time, last_time)
+        total = max(self.total_height(), 1)
+        self.scrollbar.set(self.scroll_y / total, min((self.scroll_y + height - self.HEADER_HEIGHT) / total, 1.0))
+        total = max(self.total_width(), 1)
+        self.xscrollbar.set(self.scroll_x / total, min((self.scroll_x + width) / total, 1.0))
+
+    def draw_axis(self, width, first_time, last_time):
+        self.canvas.delete("axis")
+        self.canvas.create_rectangle(0, 0, width, self.HEADER_HEIGHT, fill="#f0f0f0", outline="", tags="axis")
+        step = max(1, 10 ** math.floor(math.log10(max(80 / self.pixels_per_unit, 1))))
+        while step * self.pixels_per_unit < 60:
+            step *= 2
+        for time in range(int(first_time // step) * step, int(last_time) + step, step):
+            x = time * self.pixels_per_unit - self.scroll_x
+            self.canvas.create_line(x, self.HEADER_HEIGHT - 6, x, self.HEADER_HEIGHT, tags="axis")
+            self.canvas.create_text(x + 2, self.HEADER_HEIGHT / 2, text=str(time), anchor="w", tags="axis")
 
 
 class CPMCalculatorGUI:
-    def __init__(self, root):
+    def __init__(self, root, gantt_root=None):
         self.root = root
+        self.gantt_chart = GanttChart(gantt_root) if gantt_root is not None else None
         
 
         self.activities = []
         self.critical_path = []
         self.cpm_time = 0
-        self.graph = nx.DiGraph()
+        self.project = WorkPackage("Project")
+        self.work_packages = {}
 
         self.cpmconn = sqlite3.connect("cpm_activities.db")
         self.cursor = self.cpmconn.cursor()
@@ -59,31 +453,65 @@ class CPMCalculatorGUI:
                 dependency TEXT
             )
         """)
+        columns = [column[1] for column in self.cursor.execute("PRAGMA table_info(activities)")]
+        if "package" not in columns:
+            self.cursor.execute("ALTER TABLE activities ADD COLUMN package TEXT")
         self.cpmconn.commit()
 
+    def package_for(self, path):
+        # "Phase 1/Design" nests the Design work package inside Phase 1; an empty path is the top level
+        package = self.project
+        prefix = ""
+        for name in (part.strip() for part in (path or "").split("/")):
+            if not name:
+                continue
+            prefix = f"{prefix}/{name}" if prefix else name
+            if prefix not in self.work_packages:
+                self.work_packages[prefix] = WorkPackage(prefix)
+                package.add_activity(self.work_packages[prefix])
+            package = self.work_packages[prefix]
+        return package
+
     def load_activities(self):
-        self.cursor.execute("SELECT * FROM activities")
+        self.cursor.execute("SELECT name, duration, dependency, package FROM activities ORDER BY id")
         rows = self.cursor.fetchall()
+        skipped = []
         for row in rows:
-            name, duration, dependency = row[1], row[2], row[3]
+            name, duration, dependency, package = row
             activity = Activity(name, duration)
-            dependencies = dependency.split(",") if dependency else []
-            for dep_name in dependencies:
+            for token in (dependency or "").split(","):
+                if not token.strip():
+                    continue
+                try:
+                    dep_name, relation, lag = parse_dependency(token)
+                except ValueError:
+                    skipped.append(f"{name}: {token.strip()}")
+                    continue
                 dep_activity = next((act for act in self.activities if act.name == dep_name), None)
                 if dep_activity:
-                    activity.add_dependency(dep_activity)
-                    self.graph.add_edge(dep_activity.name, name)
+                    activity.add_dependency(dep_activity, relation, lag)
             self.activities.append(activity)
+            self.package_for(package).add_activity(activity)
+
+        if skipped:
+            messagebox.showwarning("Warning", "Skipped dependencies that could not be read:\n" + "\n".join(skipped))
 
     def add_activity(self):
         name = self.activity_name_var.get()
         duration_text = self.duration_var.get()
         dependencies_text = self.dependencies_var.get()
+        package = self.package_var.get().strip()
 
         if not name or not duration_text:
             messagebox.showerror("Error", "Please fill in both activity name and duration.")
             return
 
+        try:
+            check_activity_name(name)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
         try:
             duration = int(duration_text)
             if duration <= 0:
@@ -92,25 +520,30 @@ class CPMCalculatorGUI:
             messagebox.showerror("Error", f"Invalid input for duration: {str(e)}")
             return
 
-        dependencies = [dep.strip() for dep in dependencies_text.split(',')]
+        try:
+            dependencies = [parse_dependency(dep) for dep in dependencies_text.split(',') if dep.strip()]
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
         activity = Activity(name, duration)
 
-        for dependency in dependencies:
+        for dependency, relation, lag in dependencies:
             dependency_activity = next((a for a in self.activities if a.name == dependency), None)
             if dependency_activity:
-                activity.add_dependency(dependency_activity)
-                self.graph.add_edge(dependency_activity.name, name)
+                activity.add_dependency(dependency_activity, relation, lag)
 
         self.activities.append(activity)
+        self.package_for(package).add_activity(activity)
 
         # Insert activity into the database
-        self.cursor.execute("INSERT INTO activities (name, duration, dependency) VALUES (?, ?, ?)",
-                            (name, duration, ",".join(dependencies)))
+        self.cursor.execute("INSERT INTO activities (name, duration, dependency, package) VALUES (?, ?, ?, ?)",
+                            (name, duration, ",".join(format_dependency(*dependency) for dependency in dependencies), package))
         self.cpmconn.commit()
 
         self.activity_name_var.set("")
         self.duration_var.set("")
         self.dependencies_var.set("")
+        self.package_var.set("")
 
     def delete_activity(self):
         name = self.activity_name_delete_var.get()
@@ -126,10 +559,11 @@ class CPMCalculatorGUI:
         self.cursor.execute("DELETE FROM activities WHERE name=?", (name,))
         self.cpmconn.commit()
 
+        for activity in self.activities:
+            if activity.name == name:
+                activity.package.remove_activity(activity)
         self.activities = [activity for activity in self.activities if activity.name != name]
 
-        self.graph.remove_node(name)
-
         self.load_activity_listbox()
 
     def view_activities(self):
@@ -149,30 +583,34 @@ class CPMCalculatorGUI:
 
         ttk.Label(input_panel, text="Activity Name:").grid(row=0, column=0, sticky="e")
         ttk.Label(input_panel, text="Duration:").grid(row=1, column=0, sticky="e")
-        ttk.Label(input_panel, text="Dependencies (comma-separated):").grid(row=2, column=0, sticky="e")
+        ttk.Label(input_panel, text="Dependencies (e.g. A, B:SS+2):").grid(row=2, column=0, sticky="e")
+        ttk.Label(input_panel, text="Work Package (e.g. Phase/Package):").grid(row=3, column=0, sticky="e")
 
         self.activity_name_var = StringVar()
         self.duration_var = StringVar()
         self.dependencies_var = StringVar()
+        self.package_var = StringVar()
         self.activity_name_delete_var = StringVar()
 
         entry_name = ttk.Entry(input_panel, textvariable=self.activity_name_var)
         entry_duration = ttk.Entry(input_panel, textvariable=self.duration_var)
         entry_dependencies = ttk.Entry(input_panel, textvariable=self.dependencies_var)
+        entry_package = ttk.Entry(input_panel, textvariable=self.package_var)
         entry_name_delete = ttk.Entry(input_panel, textvariable=self.activity_name_delete_var)
 
         entry_name.grid(row=0, column=1, padx=5, pady=5)
         entry_duration.grid(row=1, column=1, padx=5, pady=5)
         entry_dependencies.grid(row=2, column=1, padx=5, pady=5)
-        entry_name_delete.grid(row=3, column=1, padx=5, pady=5)
+        entry_package.grid(row=3, column=1, padx=5, pady=5)
+        entry_name_delete.grid(row=4, column=1, padx=5, pady=5)
 
-        ttk.Button(input_panel, text="Add Activity", command=self.add_activity).grid(row=4, column=0, columnspan=2, pady=10)
-        ttk.Button(input_panel, text="Delete Activity", command=self.delete_activity).grid(row=5, column=0, columnspan=2, pady=10)
-        ttk.Button(input_panel, text="Calculate CPM", command=self.calculate_cpm).grid(row=6, column=0, columnspan=2, pady=10)
-        ttk.Button(input_panel, text="View Activities", command=self.view_activities).grid(row=7, column=0, columnspan=2, pady=10)
+        ttk.Button(input_panel, text="Add Activity", command=self.add_activity).grid(row=5, column=0, columnspan=2, pady=10)
+        ttk.Button(input_panel, text="Delete Activity", command=self.delete_activity).grid(row=6, column=0, columnspan=2, pady=10)
+        ttk.Button(input_panel, text="Calculate CPM", command=self.calculate_cpm).grid(row=7, column=0, columnspan=2, pady=10)
+        ttk.Button(input_panel, text="View Activities", command=self.view_activities).grid(row=8, column=0, columnspan=2, pady=10)
 
         self.activity_listbox = tk.Listbox(input_panel, selectmode=tk.SINGLE)
-        self.activity_listbox.grid(row=8, column=0, columnspan=2, pady=10)
+        self.activity_listbox.grid(row=9, column=0, columnspan=2, pady=10)
 
     def create_output_panel(self):
         output_panel = ttk.Frame(self.root)
@@ -182,6 +620,11 @@ class CPMCalculatorGUI:
         self.result_text.config(state=tk.DISABLED)
         self.result_text.grid(row=0, column=0)
 
+        self.network_viewer = NetworkViewer(self.root)
+        self.network_viewer.canvas.grid(row=0, column=1, rowspan=2, padx=10, pady=10, sticky="nsew")
+        self.root.columnconfigure(1, weight=1)
+        self.root.rowconfigure(1, weight=1)
+
     def calculate_cpm(self):
         self.result_text.config(state=tk.NORMAL)
         self.result_text.delete(1.0, tk.END)
@@ -206,64 +649,14 @@ class CPMCalculatorGUI:
             messagebox.showwarning("Warning", "Please add activities before calculating CPM.")
             return
 
-        start_activity = self.activities[0]
-        start_activity.earliest_start = 0
-        start_activity.earliest_finish = start_activity.duration
-
-        for current_activity in self.activities[1:]:
-            max_earliest_finish = 0
-            for dependency in current_activity.dependencies:
-                if dependency.earliest_finish > max_earliest_finish:
-                    max_earliest_finish = dependency.earliest_finish
-            current_activity.earliest_start = max_earliest_finish
-            current_activity.earliest_finish = current_activity.earliest_start + current_activity.duration
-
-        end_activity = self.activities[-1]
-        end_activity.latest_finish = end_activity.earliest_finish
-        end_activity.latest_start = end_activity.latest_finish - end_activity.duration
-
-        self.critical_path.append(end_activity)
-
-        for current_activity in reversed(self.activities[:-1]):
-            min_latest_start = float('inf')
-            for dependent_activity in self.activities:
-                if current_activity in dependent_activity.dependencies:
-                    latest_start = dependent_activity.latest_start - current_activity.duration
-                    min_latest_start = min(min_latest_start, latest_start)
-
-            current_activity.latest_start = min_latest_start
-            current_activity.latest_finish = current_activity.latest_start + current_activity.duration
-
-            current_activity.slack = current_activity.latest_start - current_activity.earliest_start
-
-            if current_activity.slack == 0 or current_activity == end_activity:
-                current_activity.set_critical_path(True)
-                self.critical_path.append(current_activity)
-
-        self.cpm_time = end_activity.earliest_finish
+        self.cpm_time = self.project.schedule_project()
+        self.critical_path = sorted((activity for activity in self.activities if activity.is_critical_path()),
+                                    key=lambda activity: activity.earliest_start, reverse=True)
 
     def display_graph(self):
-        pos = nx.spring_layout(self.graph)
-        nx.draw(self.graph, pos, with_labels=True, font_weight='bold', node_color='blue', font_color='white')
-        nx.draw_networkx_nodes(self.graph, pos, nodelist=[activity.name for activity in self.critical_path], node_color='red')
-        plt.title("Activity Graph")
-        plt.show()
-
-class PERTTask:
-    def __init__(self, name, optimistic, most_likely, pessimistic):
-        self.name = name
-        self.optimistic = optimistic
-        self.most_likely = most_likely
-        self.pessimistic = pessimistic
-        self.expected = self.calculate_expected()
-        self.variance = self.calculate_variance()
-
-    def calculate_expected(self):
-        return (self.optimistic + 4 * self.most_likely + self.pessimistic) / 6
-
-    def calculate_variance(self):
-        return ((self.pessimistic - self.optimistic) / 6) ** 2
-
+        self.network_viewer.show(self.activities)
+        if self.gantt_chart is not None:
+            self.gantt_chart.set_schedule(self.activities)
 
 class PERTCalculatorGUI:
     def __init__(self, root):
@@ -309,6 +702,9 @@ class PERTCalculatorGUI:
         self.output_text.config(state="disabled", wrap="word")
         self.output_text.grid(row=0, column=0)
 
+        self.curve_canvas = tk.Canvas(output_frame, width=360, height=220, background="white")
+        self.curve_canvas.grid(row=0, column=1, padx=(10, 0))
+
     def add_task(self):
         name = self.name_entry.get()
         optimistic = int(self.optimistic_entry.get())
@@ -396,8 +792,38 @@ class PERTCalculatorGUI:
         self.output_text.insert(tk.END, f"Project Variance: {project_variance} units^2\n")
         self.output_text.insert(tk.END, f"Project Standard Deviation: {project_standard_deviation} units\n")
 
+        for confidence in (0.5, 0.9, 0.95):
+            deadline = deadline_for_confidence(confidence, project_time, project_standard_deviation)
+            self.output_text.insert(tk.END, f"{confidence:.0%} Confidence Deadline: {deadline:.2f} units\n")
+
         self.output_text.config(state="disabled")
 
+        self.draw_probability_curve(project_time, project_standard_deviation)
+
+    def draw_probability_curve(self, project_time, project_standard_deviation, points=200):
+        import numpy as np
+
+        canvas = self.curve_canvas
+        canvas.delete("all")
+        width, height, margin = int(canvas["width"]), int(canvas["height"]), 30
+
+        spread = 4 * project_standard_deviation if project_standard_deviation > 0 else max(project_time, 1) / 2
+        low, high = max(project_time - spread, 0.0), project_time + spread
+        deadlines = np.linspace(low, high, points)
+        probabilities = completion_probability(deadlines, project_time, project_standard_deviation)
+
+        xs = margin + (deadlines - low) / (high - low) * (width - 2 * margin)
+        ys = height - margin - probabilities * (height - 2 * margin)
+        canvas.create_line(margin, height - margin, width - margin, height - margin)
+        canvas.create_line(margin, margin, margin, height - margin)
+        canvas.create_line(*np.column_stack((xs, ys)).ravel().tolist(), fill="blue", width=2)
+
+        canvas.create_text(margin, height - margin + 12, text=f"{low:.1f}")
+        canvas.create_text(width - margin, height - margin + 12, text=f"{high:.1f}")
+        canvas.create_text(margin - 12, margin, text="1")
+        canvas.create_text(margin - 12, height - margin, text="0")
+        canvas.create_text(width / 2, 12, text="P(finish <= deadline)")
+
 
 def main():
     root = tk.Tk()
@@ -408,11 +834,13 @@ def main():
 
     cpm_tab = ttk.Frame(notebook)
     pert_tab = ttk.Frame(notebook)
+    gantt_tab = ttk.Frame(notebook)
 
     notebook.add(cpm_tab, text="CPM Calculator")
     notebook.add(pert_tab, text="PERT Calculator")
+    notebook.add(gantt_tab, text="Gantt Chart")
 
-    CPMCalculatorGUI(cpm_tab)
+    CPMCalculatorGUI(cpm_tab, gantt_tab)
     PERTCalculatorGUI(pert_tab)
 
     root.mainloop()
@@ -0,0 +1,531 @@
+# Scheduling model shared by PythonMPR.py and combinedmpr.py. It imports no GUI or plotting
+# libraries, and NumPy is only loaded once an array is passed to the probability functions.
+import math
+import numbers
+import re
+
+
+RELATION_TYPES = ("FS", "SS", "FF", "SF")
+DEPENDENCY_PATTERN = re.compile(r"^(?P<name>[^:]+?)\s*(?::\s*(?P<relation>FS|SS|FF|SF)\s*(?P<lag>[+-]\s*\d+)?)?$", re.IGNORECASE)
+
+
+def parse_dependency(text):
+    # Accepts "A", "A:SS", "A:FF+2" or "A:FS-1"; a bare name is finish-to-start with no lag
+    match = DEPENDENCY_PATTERN.match(text.strip())
+    if not match:
+        raise ValueError(f"Invalid dependency '{text}'. Use NAME or NAME:TYPE[+/-LAG].")
+    relation = (match.group("relation") or "FS").upper()
+    lag = int(match.group("lag").replace(" ", "")) if match.group("lag") else 0
+    return match.group("name").strip(), relation, lag
+
+
+def check_activity_name(name):
+    # ':' and ',' delimit stored dependency tokens, so a name containing them could never be referenced
+    if ":" in name or "," in name:
+        raise ValueError("Activity names cannot contain ':' or ','.")
+
+
+def format_dependency(name, relation, lag):
+    if relation == "FS" and lag == 0:
+        return name
+    return f"{name}:{relation}{lag:+d}" if lag else f"{name}:{relation}"
+
+
+class Dependency:
+    def __init__(self, activity, relation="FS", lag=0, successor=None):
+        if relation not in RELATION_TYPES:
+            raise ValueError(f"Unknown relation type '{relation}'.")
+        self.activity = activity
+        self.successor = successor
+        self.relation = relation
+        self.lag = lag
+        self.slack = 0
+        self.critical_path = False
+
+    def start_offset(self, successor):
+        # Minimum gap between the predecessor's start and the successor's start
+        predecessor = self.activity
+        if self.relation == "FS":
+            return predecessor.duration + self.lag
+        if self.relation == "SS":
+            return self.lag
+        if self.relation == "FF":
+            return predecessor.duration + self.lag - successor.duration
+        return self.lag - successor.duration
+
+    def earliest_start_for(self, successor):
+        return self.activity.earliest_start + self.start_offset(successor)
+
+    def latest_finish_for(self, successor):
+        return successor.latest_start - self.start_offset(successor) + self.activity.duration
+
+
+class Task:
+    def __init__(self, name, duration):
+        self.name = name
+        self.duration = duration
+
+class Activity(Task):
+    def __init__(self, name, duration):
+        super().__init__(name, duration)
+        self.dependencies = []
+        self.successors = []
+        self.earliest_start = 0
+        self.earliest_finish = 0
+        self.latest_start = 0
+        self.latest_finish = 0
+        self.slack = 0
+        self.critical_path = False
+        self.package = None
+
+    def add_dependency(self, activity, relation="FS", lag=0):
+        link = Dependency(activity, relation, lag, self)
+        self.dependencies.append(link)
+        activity.successors.append(link)
+        # A new link can turn either end into a boundary activity of its work package
+        for end in (activity, self):
+            if end.package is not None:
+                end.package.invalidate()
+
+    def is_critical_path(self):
+        return self.critical_path
+
+    def set_critical_path(self, is_critical):
+        self.critical_path = is_critical
+
+
+def schedule_network(activities, links=None):
+    # One forward and one backward pass over a topological order; times are relative to the network start
+    if links is None:
+        links = {activity: activity.dependencies for activity in activities}
+
+    successors = {activity: [] for activity in activities}
+    in_degree = {activity: 0 for activity in activities}
+    for activity in activities:
+        for link in links[activity]:
+            if link.activity in successors:
+                successors[link.activity].append((link, activity))
+                in_degree[activity] += 1
+
+    order = [activity for activity in activities if in_degree[activity] == 0]
+    for current_activity in order:
+        for link, successor in successors[current_activity]:
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                order.append(successor)
+
+    if len(order) != len(activities):
+        raise ValueError("Dependencies contain a cycle.")
+
+    for current_activity in order:
+        earliest_start = 0
+        for link in links[current_activity]:
+            if link.activity in successors:
+                earliest_start = max(earliest_start, link.earliest_start_for(current_activity))
+        current_activity.earliest_start = earliest_start
+        current_activity.earliest_finish = earliest_start + current_activity.duration
+
+    cpm_time = max((activity.earliest_finish for activity in order), default=0)
+    critical_path = []
+
+    for current_activity in reversed(order):
+        latest_finish = cpm_time
+        for link, successor in successors[current_activity]:
+            latest_finish = min(latest_finish, link.latest_finish_for(successor))
+        current_activity.latest_finish = latest_finish
+        current_activity.latest_start = latest_finish - current_activity.duration
+
+        current_activity.slack = current_activity.latest_start - current_activity.earliest_start
+        current_activity.set_critical_path(current_activity.slack == 0)
+        if current_activity.is_critical_path():
+            critical_path.append(current_activity)
+
+    for current_activity in order:
+        for link in links[current_activity]:
+            if link.activity in successors:
+                link.slack = current_activity.earliest_start - link.earliest_start_for(current_activity)
+                link.critical_path = link.slack == 0 and link.activity.is_critical_path() and current_activity.is_critical_path()
+
+    return order, cpm_time, critical_path
+
+
+def topological_order(edges):
+    in_degree = {node: 0 for node in edges}
+    for node in edges:
+        for successor, _ in edges[node]:
+            in_degree[successor] += 1
+
+    order = [node for node in edges if in_degree[node] == 0]
+    for node in order:
+        for successor, _ in edges[node]:
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                order.append(successor)
+
+    if len(order) != len(edges):
+        raise ValueError("Dependencies contain a cycle.")
+    return order
+
+
+def longest_paths(order, edges, start):
+    # Longest start-to-start distances from the nodes in start; unreachable nodes are left out
+    distance = dict(start)
+    for node in order:
+        if node in distance:
+            for successor, weight in edges[node]:
+                if distance.get(successor, -math.inf) < distance[node] + weight:
+                    distance[successor] = distance[node] + weight
+    return distance
+
+
+class WorkPackage(Activity):
+    # A sub-network scheduled on its own. Its parent only sees the boundary activities (ports)
+    # that link to work outside the package, plus the longest-path offsets between them, so an
+    # edit inside one package only reschedules that package and its ancestors. A package whose
+    # summary would cost more than its own network is inlined: the parent schedules its
+    # activities directly, which is never slower than flat scheduling.
+    SUMMARY_ENTRIES = 8
+
+    def __init__(self, name):
+        super().__init__(name, 0)
+        self.activities = []
+        self.nodes = {}
+        self.owners = {}
+        self.summaries = []
+        self.edges = {}
+        self.order = []
+        self.base = {}
+        self.finish = 0
+        self.inline = False
+        self.ports = []
+        self.offsets = {}
+        self.tails = {}
+        self.needs_schedule = True
+
+    def add_activity(self, activity):
+        activity.package = self
+        self.activities.append(activity)
+        self.invalidate()
+
+    def remove_activity(self, activity):
+        self.activities.remove(activity)
+        activity.package = None
+        self.invalidate()
+        # Neighbours lose a boundary link, which can change the ports of their packages
+        for other in [link.activity for link in activity.dependencies] + [link.successor for link in activity.successors]:
+            if other.package is not None:
+                other.package.invalidate()
+
+    def invalidate(self):
+        package = self
+        while package is not None:
+            package.needs_schedule = True
+            package = package.package
+
+    def member_of(self, activity):
+        while activity is not None and activity.package is not self:
+            activity = activity.package
+        return activity
+
+    def reaches_outside(self, activities):
+        return any(other not in self.nodes and self.member_of(other) is None for other in activities)
+
+    def collect_level(self):
+        # Direct activities, the ports of summarised sub-packages and everything an inlined
+        # sub-package collected, each with its earliest start when nothing outside holds it back
+        # and the longest stretch from its start to a finish. owners maps a port to its summary.
+        self.nodes, self.owners, self.summaries = {}, {}, []
+        for member in self.activities:
+            if not isinstance(member, WorkPackage):
+                self.nodes[member] = (0, member.duration)
+                self.owners[member] = None
+                continue
+            if member.needs_schedule:
+                member.schedule()
+            if member.inline:
+                self.nodes.update(member.nodes)
+                self.owners.update(member.owners)
+                self.summaries.extend(member.summaries)
+            else:
+                for port in member.ports:
+                    self.nodes[port] = (member.base[port], member.tails[port])
+                    self.owners[port] = member
+                self.summaries.append(member)
+
+    def schedule(self):
+        self.collect_level()
+
+        # Work outside can only reach in through entry ports and continue through exit ports, so
+        # the parent needs one sweep per entry and an edge from each entry to each exit it reaches
+        entries, exits = [], []
+        if self.package is not None:
+            for node in self.nodes:
+                if self.reaches_outside(link.activity for link in node.dependencies):
+                    entries.append(node)
+                    if len(entries) > self.SUMMARY_ENTRIES:
+                        break
+            if len(entries) <= self.SUMMARY_ENTRIES:
+                exits = [node for node in self.nodes if self.reaches_outside(link.successor for link in node.successors)]
+        self.inline = (len(entries) > self.SUMMARY_ENTRIES or
+                       len(entries) * len(exits) > self.SUMMARY_ENTRIES * len(self.nodes))
+        self.ports, self.offsets, self.tails = [], {}, {}
+        if self.inline:
+            self.needs_schedule = False
+            return
+
+        self.edges = {node: [] for node in self.nodes}
+        for package in self.summaries:
+            for port, reach in package.offsets.items():
+                self.edges[port].extend(reach.items())
+        for node, owner in self.owners.items():
+            for link in node.dependencies:
+                predecessor = link.activity
+                if predecessor in self.owners and (owner is None or self.owners[predecessor] is not owner):
+                    self.edges[predecessor].append((node, link.start_offset(node)))
+        self.order = topological_order(self.edges)
+
+        self.base = longest_paths(self.order, self.edges, {node: lower for node, (lower, _) in self.nodes.items()})
+        self.finish = max([self.base[node] + tail for node, (_, tail) in self.nodes.items()] +
+                          [package.finish for package in self.summaries], default=0)
+
+        self.ports = list(dict.fromkeys(entries + exits))
+        self.needs_schedule = False
+        if not self.ports:
+            return
+
+        position = {node: index for index, node in enumerate(self.order)}
+        for entry in entries:
+            reach = longest_paths(self.order[position[entry]:], self.edges, {entry: 0})
+            self.offsets[entry] = {node: reach[node] for node in exits if node is not entry and node in reach}
+
+        tails = {}
+        for node in reversed(self.order):
+            tails[node] = max([self.nodes[node][1]] + [weight + tails[successor] for successor, weight in self.edges[node]])
+        self.tails = {port: tails[port] for port in self.ports}
+
+    def passes(self, project_finish, earliest, latest):
+        # Both passes over this level with the ports pinned to the times found one level up
+        earliest_start = self.base
+        if earliest:
+            start = {node: lower for node, (lower, _) in self.nodes.items()}
+            for node, value in earliest.items():
+                start[node] = max(start[node], value)
+            earliest_start = longest_paths(self.order, self.edges, start)
+
+        latest_start = {node: project_finish - tail for node, (_, tail) in self.nodes.items()}
+        for node, value in latest.items():
+            latest_start[node] = min(latest_start[node], value)
+        for node in reversed(self.order):
+            for successor, weight in self.edges[node]:
+                if latest_start[node] > latest_start[successor] - weight:
+                    latest_start[node] = latest_start[successor] - weight
+        return earliest_start, latest_start
+
+    def resolve(self, project_finish, earliest=None, latest=None):
+        # An inlined package receives its parent's results, which already cover all of its nodes
+        if not self.inline:
+            earliest, latest = self.passes(project_finish, earliest or {}, latest or {})
+
+        for member in self.activities:
+            if not isinstance(member, WorkPackage):
+                member.earliest_start = earliest[member]
+                member.earliest_finish = member.earliest_start + member.duration
+                member.latest_start = latest[member]
+                member.latest_finish = member.latest_start + member.duration
+                member.slack = member.latest_start - member.earliest_start
+                member.set_critical_path(member.slack == 0)
+            elif member.inline:
+                member.resolve(project_finish, earliest, latest)
+            else:
+                member.resolve(project_finish, {port: earliest[port] for port in member.ports},
+                               {port: latest[port] for port in member.ports})
+
+        # The package itself is summarised as the span of its members
+        self.earliest_start = min((member.earliest_start for member in self.activities), default=0)
+        self.earliest_finish = max((member.earliest_finish for member in self.activities), default=0)
+        self.latest_start = min((member.latest_start for member in self.activities), default=0)
+        self.latest_finish = max((member.latest_finish for member in self.activities), default=0)
+        self.duration = self.earliest_finish - self.earliest_start
+        self.slack = min((member.slack for member in self.activities), default=0)
+        self.set_critical_path(any(member.is_critical_path() for member in self.activities))
+
+    def leaves(self):
+        for member in self.activities:
+            if isinstance(member, WorkPackage):
+                yield from member.leaves()
+            else:
+                yield member
+
+    def schedule_project(self):
+        if self.needs_schedule:
+            self.schedule()
+        self.resolve(self.finish)
+
+        leaves = set(self.leaves())
+        for activity in leaves:
+            for link in activity.dependencies:
+                if link.activity in leaves:
+                    link.slack = activity.earliest_start - link.earliest_start_for(activity)
+                    link.critical_path = link.slack == 0 and link.activity.is_critical_path() and activity.is_critical_path()
+        return self.finish
+
+
+# W. J. Cody's rational Chebyshev approximations for the normal CDF, as used by R's pnorm
+NORMAL_CDF_A = (2.2352520354606839287, 161.02823106855587881, 1067.6894854603709582, 18154.981253343561249,
+                0.065682337918207449113)
+NORMAL_CDF_B = (47.20258190468824187, 976.09855173777669322, 10260.932208618978205, 45507.789335026729956)
+NORMAL_CDF_C = (0.39894151208813466764, 8.8831497943883759412, 93.506656132177855979, 597.27027639480026226,
+                2494.5375852903726711, 6848.1904505362823326, 11602.651437647350124, 9842.7148383839780218,
+                1.0765576773720192317e-8)
+NORMAL_CDF_D = (22.266688044328115691, 235.38790178262499861, 1519.377599407554805, 6485.558298266760755,
+                18615.571640885098091, 34900.952721145977266, 38912.003286093271411, 19685.429676859990727)
+NORMAL_CDF_P = (0.21589853405795699, 0.1274011611602473639, 0.022235277870649807, 0.001421619193227893466,
+                2.9112874951168792e-5, 0.02307344176494017303)
+NORMAL_CDF_Q = (1.28426009614491121, 0.468238212480865118, 0.0659881378689285515, 0.00378239633202758244,
+                7.29751555083966205e-5)
+
+
+def normal_cdf(z):
+    # Scalars go through math.erfc; arrays evaluate Cody's approximation, which agrees to double precision
+    if isinstance(z, numbers.Real):
+        return 0.5 * math.erfc(-float(z) / math.sqrt(2.0))
+    import numpy as np
+
+    z = np.asarray(z, dtype=float)
+    y = np.abs(z)
+    cdf = np.full(z.shape, np.nan)
+    a, b, c, d, p, q = NORMAL_CDF_A, NORMAL_CDF_B, NORMAL_CDF_C, NORMAL_CDF_D, NORMAL_CDF_P, NORMAL_CDF_Q
+
+    central = y <= 0.67448975
+    x = z[central]
+    square = x * x
+    numerator, denominator = a[4] * square, square
+    for i in range(3):
+        numerator = (numerator + a[i]) * square
+        denominator = (denominator + b[i]) * square
+    cdf[central] = 0.5 + x * (numerator + a[3]) / (denominator + b[3])
+
+    middle = ~central & (y <= math.sqrt(32.0))
+    x = y[middle]
+    numerator, denominator = c[8] * x, x
+    for i in range(7):
+        numerator = (numerator + c[i]) * x
+        denominator = (denominator + d[i]) * x
+    tail = (numerator + c[7]) / (denominator + d[7]) * gaussian_factor(x)
+    cdf[middle] = np.where(z[middle] > 0, 1.0 - tail, tail)
+
+    outer = y > math.sqrt(32.0)
+    x = y[outer]
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        square = 1.0 / (x * x)
+        numerator, denominator = p[5] * square, square
+        for i in range(4):
+            numerator = (numerator + p[i]) * square
+            denominator = (denominator + q[i]) * square
+        tail = (1.0 / math.sqrt(2.0 * math.pi) - square * (numerator + p[4]) / (denominator + q[4])) / x
+        tail = np.where(np.isinf(x), 0.0, tail * gaussian_factor(x))
+    cdf[outer] = np.where(z[outer] > 0, 1.0 - tail, tail)
+    return cdf
+
+
+def gaussian_factor(x):
+    # exp(-x*x/2) split so that x*x is not rounded before exponentiating, which keeps far tails accurate
+    import numpy as np
+
+    with np.errstate(invalid="ignore", over="ignore"):
+        rounded = np.trunc(x * 16.0) / 16.0
+        remainder = (x - rounded) * (x + rounded)
+        return np.exp(-rounded * rounded * 0.5) * np.exp(-remainder * 0.5)
+
+
+# Wichura's AS241 coefficients, highest degree first for np.polyval
+NORMAL_PPF_CENTRAL = (
+    (2.5090809287301226727e+3, 3.3430575583588128105e+4, 6.7265770927008700853e+4, 4.5921953931549871457e+4,
+     1.3731693765509461125e+4, 1.9715909503065514427e+3, 1.3314166789178437745e+2, 3.3871328727963666080e+0),
+    (5.2264952788528545610e+3, 2.8729085735721942674e+4, 3.9307895800092710610e+4, 2.1213794301586595867e+4,
+     5.3941960214247511077e+3, 6.8718700749205790830e+2, 4.2313330701600911252e+1, 1.0),
+)
+NORMAL_PPF_INTERMEDIATE = (
+    (7.7454501427834140764e-4, 2.2723844989269184583e-2, 2.4178072517745061177e-1, 1.2704582524523683826e+0,
+     3.6478483247632046050e+0, 5.7694972214606914055e+0, 4.6303378461565452959e+0, 1.4234371107496835773e+0),
+    (1.0507500716444168432e-9, 5.4759380849953449460e-4, 1.5198666563616457197e-2, 1.4810397642748007459e-1,
+     6.8976733498510000455e-1, 1.6763848301838038494e+0, 2.0531916266377588219e+0, 1.0),
+)
+NORMAL_PPF_TAIL = (
+    (2.0103343992922881327e-7, 2.7115555687434875782e-5, 1.2426609473880784386e-3, 2.6532189526576123093e-2,
+     2.9656057182850489123e-1, 1.7848265399172913358e+0, 5.4637849111641143699e+0, 6.6579046435011037772e+0),
+    (2.0442631033899397856e-15, 1.4215117583164458887e-7, 1.8463183175100546818e-5, 7.8686913114561325910e-4,
+     1.4875361290850614853e-2, 1.3692988092273580531e-1, 5.9983220655588793769e-1, 1.0),
+)
+
+
+def normal_ppf(p):
+    # Scalars go through statistics.NormalDist; arrays evaluate the same AS241 approximation with NumPy.
+    # 0 and 1 map to -inf and inf; NaN and anything outside [0, 1] give NaN.
+    if isinstance(p, numbers.Real):
+        from statistics import NormalDist
+        p = float(p)
+        if not 0.0 <= p <= 1.0:
+            return math.nan
+        if p == 0.0 or p == 1.0:
+            return -math.inf if p == 0.0 else math.inf
+        return NormalDist().inv_cdf(p)
+    import numpy as np
+    p = np.asarray(p, dtype=float)
+    q = p - 0.5
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = 0.180625 - q * q
+        central = q * np.polyval(NORMAL_PPF_CENTRAL[0], r) / np.polyval(NORMAL_PPF_CENTRAL[1], r)
+
+        r = np.sqrt(-np.log(np.minimum(p, 1.0 - p)))
+        tail = np.where(
+            r <= 5.0,
+            np.polyval(NORMAL_PPF_INTERMEDIATE[0], r - 1.6) / np.polyval(NORMAL_PPF_INTERMEDIATE[1], r - 1.6),
+            np.polyval(NORMAL_PPF_TAIL[0], r - 5.0) / np.polyval(NORMAL_PPF_TAIL[1], r - 5.0),
+        )
+    quantile = np.where(np.abs(q) <= 0.425, central, np.copysign(tail, q))
+    quantile = np.where(p == 0.0, -np.inf, np.where(p == 1.0, np.inf, quantile))
+    return np.where((p >= 0.0) & (p <= 1.0), quantile, np.nan)
+
+
+def completion_probability(deadlines, expected, standard_deviation):
+    # P(project finish <= deadline) for a scalar or any array of deadlines
+    if isinstance(deadlines, numbers.Real):
+        if standard_deviation == 0:
+            return float(deadlines >= expected)
+        return normal_cdf((deadlines - expected) / standard_deviation)
+    import numpy as np
+    deadlines = np.asarray(deadlines, dtype=float)
+    if standard_deviation == 0:
+        return (deadlines >= expected).astype(float)
+    return normal_cdf((deadlines - expected) / standard_deviation)
+
+
+def deadline_for_confidence(confidence, expected, standard_deviation):
+    # Inverse of completion_probability: the deadline met with the given probability
+    if isinstance(confidence, numbers.Real):
+        if standard_deviation == 0:
+            return float(expected) if 0.0 <= confidence <= 1.0 else math.nan
+        return expected + standard_deviation * normal_ppf(confidence)
+    import numpy as np
+    confidence = np.asarray(confidence, dtype=float)
+    if standard_deviation == 0:
+        return np.where((confidence >= 0.0) & (confidence <= 1.0), float(expected), np.nan)
+    return expected + standard_deviation * normal_ppf(confidence)
+
+
+class PERTTask:
+    def __init__(self, name, optimistic, most_likely, pessimistic):
+        self.name = name
+        self.optimistic = optimistic
+        self.most_likely = most_likely
+        self.pessimistic = pessimistic
+        self.expected = self.calculate_expected()
+        self.variance = self.calculate_variance()
+
+    def calculate_expected(self):
+        return (self.optimistic + 4 * self.most_likely + self.pessimistic) / 6
+
+    def calculate_variance(self):
+        return ((self.pessimistic - self.optimistic) / 6) ** 2
+
@@ -0,0 +1,187 @@
+import random
+
+import pytest
+
+import combinedmpr
+from mprcore import Activity, schedule_network
+
+
+class FakeCanvas:
+    # Records canvas items without a display; only the calls the viewers make are provided
+    def __init__(self, *args, **kwargs):
+        self.items = {}
+        self.next_item = 1
+        self.width = kwargs.get("width", 600)
+        self.height = kwargs.get("height", 450)
+
+    def create(self, kind, coords, options):
+        self.items[self.next_item] = [kind, list(coords), dict(options)]
+        self.next_item += 1
+        return self.next_item - 1
+
+    def create_line(self, *coords, **options):
+        return self.create("line", coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self.create("oval", coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self.create("rectangle", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self.create("text", coords, options)
+
+    def itemconfigure(self, item, **options):
+        self.items[item][2].update(options)
+
+    def coords(self, item, *coords):
+        self.items[item][1] = list(coords)
+
+    def delete(self, *tags):
+        for tag in tags:
+            if tag == "all":
+                self.items.clear()
+            else:
+                self.items = {item: value for item, value in self.items.items() if not self.matches(item, value, tag)}
+
+    @staticmethod
+    def matches(item, value, tag):
+        tags = value[2].get("tags", ())
+        return item == tag or tag in ((tags,) if isinstance(tags, str) else tags)
+
+    def move(self, tag, dx, dy):
+        pass
+
+    def scale(self, tag, x, y, sx, sy):
+        pass
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def bind(self, sequence, callback):
+        pass
+
+    def grid(self, **options):
+        pass
+
+    def after(self, delay, callback):
+        return None
+
+    def after_cancel(self, job):
+        pass
+
+
+class FakeScrollbar:
+    def __init__(self, parent, orient=None, command=None):
+        self.first, self.last = 0.0, 1.0
+
+    def grid(self, **options):
+        pass
+
+    def set(self, first, last):
+        self.first, self.last = first, last
+
+
+class FakeFrame:
+    def columnconfigure(self, index, weight=0):
+        pass
+
+    def rowconfigure(self, index, weight=0):
+        pass
+
+
+class ZoomEvent:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+@pytest.fixture
+def viewer(monkeypatch):
+    monkeypatch.setattr(combinedmpr.tk, "Canvas", FakeCanvas)
+    return combinedmpr.NetworkViewer(None)
+
+
+def test_zoomed_out_long_chain_stays_within_item_budget(viewer):
+    # Every activity of the chain lands in its own grid cell, so the cells alone would be 100,000 items
+    activities = [Activity(f"A{index}", 5) for index in range(100000)]
+    for predecessor, successor in zip(activities, activities[1:]):
+        successor.add_dependency(predecessor)
+    schedule_network(activities)
+
+    viewer.show(activities)
+    assert 0 < len(viewer.canvas.items) <= viewer.MAX_ITEMS
+    for factor in (3.0, 10.0, 0.5):
+        viewer.zoom(ZoomEvent(300, viewer.offset_y), factor)
+        viewer.redraw()
+        assert 0 < len(viewer.canvas.items) <= viewer.MAX_ITEMS
+
+    sizes = [item[1][2] - item[1][0] for item in viewer.canvas.items.values() if item[0] == "rectangle"]
+    assert min(sizes) >= viewer.MIN_BIN_PIXELS
+
+
+def test_critical_only_edges_follow_a_changed_critical_path(viewer):
+    # 40 layers of 50 activities with two links each: too many edges to draw, so only critical links are kept
+    rng = random.Random(5)
+    layers = [[Activity(f"L{layer}-{lane}", 1) for lane in range(50)] for layer in range(40)]
+    for previous, current in zip(layers, layers[1:]):
+        for activity in current:
+            for predecessor in rng.sample(previous, 2):
+                activity.add_dependency(predecessor)
+    activities = [activity for layer in layers for activity in layer]
+
+    def drawn_links():
+        return {link for link, item in viewer.edge_items.items() if item in viewer.canvas.items}
+
+    first, second = layers[-1][0], layers[-1][1]
+    first.duration = 2
+    schedule_network(activities)
+    viewer.show(activities)
+    assert viewer.critical_only
+    assert drawn_links() == {link for activity in activities for link in activity.dependencies if link.critical_path}
+
+    # The same layout with the critical path moved to a different final activity
+    first.duration, second.duration = 1, 2
+    schedule_network(activities)
+    viewer.show(activities)
+    critical = {link for activity in activities for link in activity.dependencies if link.critical_path}
+    assert second.dependencies[0] in critical and first.dependencies[0] not in critical
+    assert drawn_links() == critical
+
+
+@pytest.fixture
+def gantt_chart(monkeypatch):
+    monkeypatch.setattr(combinedmpr.tk, "Canvas", FakeCanvas)
+    monkeypatch.setattr(combinedmpr.ttk, "Scrollbar", FakeScrollbar)
+    chart = combinedmpr.GanttChart(FakeFrame())
+    activities = [Activity(f"A{index}", 1) for index in range(100000)]
+    for predecessor, successor in zip(activities, activities[1:]):
+        successor.add_dependency(predecessor)
+    schedule_network(activities)
+    chart.set_schedule(activities)
+    return chart
+
+
+def test_gantt_vertical_jump_brings_its_rows_into_view(gantt_chart):
+    gantt_chart.yview("moveto", "0.5")
+    first_row, last_row = gantt_chart.visible_rows()
+    assert first_row == 50000
+    assert gantt_chart.drawn
+    assert all(first_row <= row < last_row for (row, *_), _ in gantt_chart.drawn.values())
+    assert gantt_chart.scroll_x == 50000 * gantt_chart.pixels_per_unit
+
+
+def test_gantt_horizontal_scrollbar_moves_the_time_window(gantt_chart):
+    gantt_chart.xview("moveto", "0.25")
+    assert gantt_chart.scroll_x == 25000 * gantt_chart.pixels_per_unit
+    assert gantt_chart.xscrollbar.first == pytest.approx(0.25)
+
+    gantt_chart.xview("scroll", "1", "pages")
+    assert gantt_chart.scroll_x == 25000 * gantt_chart.pixels_per_unit + gantt_chart.canvas.winfo_width()
+
+    gantt_chart.xview("moveto", "1.0")
+    assert gantt_chart.scroll_x == gantt_chart.total_width() - gantt_chart.canvas.winfo_width()
+    assert gantt_chart.xscrollbar.last == 1.0
@@ -0,0 +1,296 @@
+import math
+import random
+import time
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from mprcore import (RELATION_TYPES, Activity, WorkPackage, check_activity_name, completion_probability,
+                     deadline_for_confidence, format_dependency, normal_cdf, normal_ppf, parse_dependency,
+                     schedule_network)
+
+
+def test_normal_cdf_array_matches_scalar_to_double_precision():
+    # Below about -37.5 the result is subnormal and loses relative precision in any implementation
+    z = np.linspace(-37.0, 37.0, 200001)
+    expected = np.array([normal_cdf(float(value)) for value in z])
+    assert np.allclose(normal_cdf(z), expected, rtol=1e-12, atol=0.0)
+
+
+def test_normal_cdf_matches_normal_dist_in_the_body():
+    z = np.linspace(-6.0, 6.0, 2001)
+    expected = np.array([NormalDist().cdf(value) for value in z])
+    assert np.allclose(normal_cdf(z), expected, rtol=1e-13, atol=1e-16)
+
+
+def test_normal_cdf_special_values():
+    result = normal_cdf(np.array([-np.inf, np.inf, np.nan, 0.0]))
+    assert result[0] == 0.0
+    assert result[1] == 1.0
+    assert math.isnan(result[2])
+    assert result[3] == 0.5
+    assert normal_cdf(np.array([-5.0]))[0] == pytest.approx(2.866515718791939e-07, rel=1e-13)
+
+
+def test_normal_ppf_matches_normal_dist():
+    p = np.concatenate([np.linspace(1e-12, 1 - 1e-12, 100001), [1e-300, 1e-20]])
+    expected = np.array([NormalDist().inv_cdf(value) for value in p])
+    assert np.allclose(normal_ppf(p), expected, rtol=1e-13, atol=1e-13)
+    assert normal_ppf(0.975) == NormalDist().inv_cdf(0.975)
+
+
+def test_normal_ppf_edges():
+    result = normal_ppf(np.array([0.0, 1.0, np.nan, -0.1, 1.1]))
+    assert result[0] == -np.inf and result[1] == np.inf
+    assert np.isnan(result[2:]).all()
+    assert normal_ppf(0.0) == -math.inf and normal_ppf(1.0) == math.inf
+    assert math.isnan(normal_ppf(math.nan)) and math.isnan(normal_ppf(2.0))
+
+
+def test_deadline_for_confidence_inverts_completion_probability():
+    confidence = np.linspace(0.001, 0.999, 999)
+    deadlines = deadline_for_confidence(confidence, 50.0, 5.0)
+    assert np.allclose(completion_probability(deadlines, 50.0, 5.0), confidence, rtol=1e-12)
+    assert deadline_for_confidence(0.5, 50.0, 5.0) == 50.0
+
+
+def test_zero_standard_deviation():
+    assert deadline_for_confidence(0.0, 50.0, 0.0) == 50.0
+    assert deadline_for_confidence(1.0, 50.0, 0.0) == 50.0
+    assert math.isnan(deadline_for_confidence(math.nan, 50.0, 0.0))
+    result = deadline_for_confidence(np.array([0.0, 0.5, 1.0, np.nan]), 50.0, 0.0)
+    assert np.array_equal(result[:3], [50.0, 50.0, 50.0]) and math.isnan(result[3])
+    assert np.array_equal(completion_probability(np.array([49.0, 50.0, 51.0]), 50.0, 0.0), [0.0, 1.0, 1.0])
+
+
+def test_million_deadlines_evaluate_quickly():
+    deadlines = np.linspace(0.0, 100.0, 10 ** 6)
+    completion_probability(deadlines, 50.0, 5.0)
+    start = time.perf_counter()
+    probabilities = completion_probability(deadlines, 50.0, 5.0)
+    elapsed = time.perf_counter() - start
+    assert probabilities.shape == deadlines.shape
+    assert elapsed < 0.5
+
+
+# A (3) links to B (2) with the given relation and lag; an unrelated C (10) sets the project length,
+# so the expected (ES, EF, LS, LF) of A and B and the link slack are worked out by hand
+@pytest.mark.parametrize("relation, lag, expected_a, expected_b, link_slack", [
+    ("FS", 2, (0, 3, 3, 6), (5, 7, 8, 10), 0),
+    ("FS", -2, (0, 3, 7, 10), (1, 3, 8, 10), 0),
+    ("SS", 1, (0, 3, 7, 10), (1, 3, 8, 10), 0),
+    ("FF", 1, (0, 3, 6, 9), (2, 4, 8, 10), 0),
+    ("SF", 4, (0, 3, 6, 9), (2, 4, 8, 10), 0),
+    ("SS", -5, (0, 3, 7, 10), (0, 2, 8, 10), 5),
+    ("FF", -2, (0, 3, 7, 10), (0, 2, 8, 10), 1),
+])
+def test_relation_types_by_hand(relation, lag, expected_a, expected_b, link_slack):
+    a, b, c = Activity("A", 3), Activity("B", 2), Activity("C", 10)
+    b.add_dependency(a, relation, lag)
+    _, cpm_time, critical_path = schedule_network([a, b, c])
+    assert cpm_time == 10
+    assert critical_path == [c]
+    for activity, expected in ((a, expected_a), (b, expected_b)):
+        times = (activity.earliest_start, activity.earliest_finish, activity.latest_start, activity.latest_finish)
+        assert times == expected
+        assert activity.slack == expected[2] - expected[0]
+    assert b.dependencies[0].slack == link_slack
+    assert not b.dependencies[0].critical_path
+
+
+def test_critical_links_by_hand():
+    # A (3) -FS+2-> B (2) -SS+1-> D (4) and A -FF+0-> E (1): the project ends with D at 10
+    a, b, d, e = Activity("A", 3), Activity("B", 2), Activity("D", 4), Activity("E", 1)
+    b.add_dependency(a, "FS", 2)
+    d.add_dependency(b, "SS", 1)
+    e.add_dependency(a, "FF", 0)
+    _, cpm_time, critical_path = schedule_network([a, b, d, e])
+    assert cpm_time == 10
+    assert [activity.name for activity in critical_path] == ["D", "B", "A"]
+    assert (e.earliest_start, e.earliest_finish, e.latest_start, e.latest_finish, e.slack) == (2, 3, 9, 10, 7)
+    assert b.dependencies[0].critical_path and d.dependencies[0].critical_path
+    assert e.dependencies[0].slack == 0 and not e.dependencies[0].critical_path
+
+
+def test_cycle_is_rejected():
+    a, b = Activity("A", 1), Activity("B", 1)
+    a.add_dependency(b)
+    b.add_dependency(a, "SS", 1)
+    with pytest.raises(ValueError, match="Dependencies contain a cycle."):
+        schedule_network([a, b])
+
+
+@pytest.mark.parametrize("dependency", [("A", "FS", 0), ("A", "SS", 0), ("Build", "FF", 2), ("Site work", "SF", -3),
+                                        ("A", "FS", 1)])
+def test_dependency_round_trip(dependency):
+    assert parse_dependency(format_dependency(*dependency)) == dependency
+
+
+def test_parse_dependency_forms():
+    assert parse_dependency("A") == ("A", "FS", 0)
+    assert parse_dependency(" a : ss + 2 ") == ("a", "SS", 2)
+    assert parse_dependency("A:ff-1") == ("A", "FF", -1)
+
+
+@pytest.mark.parametrize("text", ["A:XX", "A:SS+", "A:FS+x", ":SS", "", "A:SS:FF"])
+def test_parse_dependency_rejects(text):
+    with pytest.raises(ValueError):
+        parse_dependency(text)
+
+
+def test_activity_names_cannot_hold_delimiters():
+    check_activity_name("Site work")
+    for name in ("A:B", "A,B"):
+        with pytest.raises(ValueError):
+            check_activity_name(name)
+
+
+def flat_schedule(project):
+    # Reference result: the same leaves scheduled as one flat network
+    leaves = list(project.leaves())
+    _, cpm_time, _ = schedule_network(leaves)
+    times = {activity: (activity.earliest_start, activity.latest_start, activity.slack, activity.is_critical_path())
+             for activity in leaves}
+    links = {link: (link.slack, link.critical_path) for activity in leaves for link in activity.dependencies}
+    return cpm_time, times, links
+
+
+def assert_grouped_matches_flat(project):
+    cpm_time, times, links = flat_schedule(project)
+    assert project.schedule_project() == cpm_time
+    for activity, expected in times.items():
+        assert (activity.earliest_start, activity.latest_start, activity.slack, activity.is_critical_path()) == expected, activity.name
+    for link, expected in links.items():
+        assert (link.slack, link.critical_path) == expected
+
+
+def random_project(rng, size):
+    project = WorkPackage("Project")
+    packages = [project]
+    for index in range(rng.randint(1, 6)):
+        package = WorkPackage(f"P{index}")
+        rng.choice(packages).add_activity(package)
+        packages.append(package)
+
+    activities = []
+    for index in range(size):
+        activity = Activity(f"A{index}", rng.randint(1, 10))
+        for predecessor in rng.sample(activities, min(len(activities), rng.randint(0, 3))):
+            activity.add_dependency(predecessor, rng.choice(RELATION_TYPES), rng.randint(-3, 5))
+        rng.choice(packages).add_activity(activity)
+        activities.append(activity)
+    return project, activities
+
+
+def build(durations, links, packages):
+    project = WorkPackage("Project")
+    activities = {name: Activity(name, duration) for name, duration in durations.items()}
+    for successor, predecessor in links:
+        activities[successor].add_dependency(activities[predecessor])
+    for name in activities:
+        package = packages.get(name)
+        if package is not None and package not in project.activities:
+            project.add_activity(package)
+        (package or project).add_activity(activities[name])
+    return project, activities
+
+
+def test_work_package_interleaved_with_outside_work_is_not_a_cycle():
+    package = WorkPackage("P1")
+    project, activities = build({"A": 1, "B": 2, "C": 3}, [("B", "A"), ("C", "B")],
+                                {"A": package, "C": package, "B": WorkPackage("P2")})
+    assert project.schedule_project() == 6
+    assert activities["C"].earliest_start == 3
+
+
+def test_work_package_members_are_placed_individually():
+    package = WorkPackage("P1")
+    project, activities = build({"A": 1, "C": 1, "D": 10, "E": 10}, [("C", "D"), ("E", "A")],
+                                {"A": package, "C": package})
+    assert project.schedule_project() == 11
+    assert activities["A"].earliest_start == 0 and activities["C"].earliest_start == 10
+
+
+def test_work_package_latest_times_see_outside_successors():
+    package = WorkPackage("P1")
+    project, activities = build({"A": 1, "B": 10, "E": 10}, [("E", "A")], {"A": package, "B": package})
+    assert project.schedule_project() == 11
+    assert activities["A"].slack == 0 and activities["A"].is_critical_path()
+
+
+@pytest.mark.parametrize("summary_entries", [0, WorkPackage.SUMMARY_ENTRIES, 10 ** 9])
+def test_grouped_schedule_matches_flat_schedule(monkeypatch, summary_entries):
+    # 0 inlines every package with an entry port and 10 ** 9 summarises every package
+    monkeypatch.setattr(WorkPackage, "SUMMARY_ENTRIES", summary_entries)
+    rng = random.Random(2024)
+    for _ in range(300):
+        project, _ = random_project(rng, rng.randint(1, 40))
+        assert_grouped_matches_flat(project)
+
+
+def test_grouped_schedule_after_incremental_edits():
+    rng = random.Random(7)
+    for _ in range(50):
+        project, activities = random_project(rng, 30)
+        project.schedule_project()
+        for _ in range(5):
+            activity = rng.choice(activities)
+            activity.duration = rng.randint(1, 10)
+            activity.package.invalidate()
+            later = rng.choice(activities[activities.index(activity):])
+            if later is not activity:
+                later.add_dependency(activity, rng.choice(RELATION_TYPES), rng.randint(-3, 5))
+            assert_grouped_matches_flat(project)
+
+
+def interleaved_project(size):
+    # Two packages taking turns along the network, so almost every activity is a boundary port
+    rng = random.Random(11)
+    project = WorkPackage("Project")
+    packages = [WorkPackage("P1"), WorkPackage("P2")]
+    for package in packages:
+        project.add_activity(package)
+    activities = []
+    for index in range(size):
+        activity = Activity(f"A{index}", rng.randint(1, 10))
+        for _ in range(2):
+            if activities:
+                activity.add_dependency(activities[-rng.randint(1, min(len(activities), 20))])
+        packages[index % 2].add_activity(activity)
+        activities.append(activity)
+    return project, packages, activities
+
+
+def best_time(function, runs=3):
+    best = math.inf
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_port_heavy_packages_are_inlined():
+    project, packages, activities = interleaved_project(20000)
+    assert project.schedule_project() == schedule_network(activities)[1]
+    assert all(package.inline for package in packages)
+    assert sum(len(edges) for edges in project.edges.values()) == sum(len(activity.dependencies) for activity in activities)
+
+    def grouped():
+        for package in packages:
+            package.invalidate()
+        project.schedule_project()
+
+    assert best_time(grouped) < 1.5 * best_time(lambda: schedule_network(activities))
+
+
+def test_package_with_few_ports_is_summarised():
+    package = WorkPackage("P1")
+    project, activities = build({"A": 1, "B": 4, "C": 2, "D": 3, "E": 5},
+                                [("B", "A"), ("C", "B"), ("D", "B"), ("E", "C"), ("E", "D")],
+                                {"B": package, "C": package, "D": package})
+    assert project.schedule_project() == 13
+    assert not package.inline
+    assert package.ports == [activities["B"], activities["C"], activities["D"]]
+    assert package.offsets == {activities["B"]: {activities["C"]: 4, activities["D"]: 4}}